@@ -5,8 +5,62 @@ The evaluation is used in depth-limited search to estimate the value of position
 where exhaustive search is impractical.
 """
 
-from typing import List, Optional, Tuple
-from game_engine import terminal, utility
+from functools import lru_cache
+from typing import Tuple
+from game_engine import _compiled_winner
+
+
+def clear_eval_cache() -> None:
+    """Drop all cached evaluations (e.g. between games or benchmarks)."""
+    _evaluate_bb.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _lines(m: int, k: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Precompute all line index sequences for an m×m board.
+    Each line (row, column, diagonal, anti-diagonal) is a tuple of flat
+    board indices (r*m + c). The geometry only depends on (m, k), so it is
+    computed once and cached instead of being rebuilt on every call.
+    """
+    lines = []
+
+    # Rows
+    for r in range(m):
+        lines.append(tuple(r * m + c for c in range(m)))
+
+    # Columns
+    for c in range(m):
+        lines.append(tuple(r * m + c for r in range(m)))
+
+    # Diagonals (top-left to bottom-right)
+    for start_r in range(m - k + 1):
+        for start_c in range(m - k + 1):
+            lines.append(tuple((start_r + i) * m + start_c + i
+                               for i in range(m - max(start_r, start_c))))
+
+    # Anti-diagonals (top-right to bottom-left)
+    for start_r in range(m - k + 1):
+        for start_c in range(k - 1, m):
+            lines.append(tuple((start_r + i) * m + start_c - i
+                               for i in range(min(m - start_r, start_c + 1))))
+
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def _window_masks(m: int, k: int) -> Tuple[int, ...]:
+    """
+    Precompute every k-cell window bitmask for an m×m board.
+    Derived by sliding a k-window along each precomputed line. Kept as a
+    plain sequence (overlapping diagonal segments repeat some windows)
+    so the scores match the line-based scoring exactly.
+    """
+    masks = []
+    for idxs in _lines(m, k):
+        for i in range(len(idxs) - k + 1):
+            masks.append(sum(1 << j for j in idxs[i:i + k]))
+    return tuple(masks)
 
 
 def evaluate(state: dict) -> float:
@@ -15,116 +69,136 @@ def evaluate(state: dict) -> float:
     This function estimates the value of a position based on:
     1. Potential winning sequences for both players
     2. Center control (strategic positional advantage)
+    Thin unpacking shim: the real work (and the memoization) lives in
+    _evaluate_bb, keyed directly on the bitboards.
     """
-    # Check terminal states first
-    if terminal(state):
-        u = utility(state)
-        return u if u is not None else 0
-    
-    board = state['board']
-    m = state['m']
-    k = state['k']
-    
-    score = 0.0
-    
-    # Evaluate all lines (rows, columns, diagonals)
-    score += _evaluate_rows(board, m, k)
-    score += _evaluate_columns(board, m, k)
-    score += _evaluate_diagonals(board, m, k)
-    score += _evaluate_anti_diagonals(board, m, k)
-    
-    # Add center control bonus
-    score += _center_control_bonus(board, m)
-    
-    return score
+    return _evaluate_bb(state['x'], state['o'], state['m'], state['k'])
 
 
-def _count_sequences(line: List[Optional[str]], k: int) -> Tuple[int, int]:
-    """
-    Count potential k-in-a-row sequences for both players in a line.
-    Uses a sliding window approach to evaluate all k-length segments.
-    Only counts sequences that are not blocked by the opponent.
+@lru_cache(maxsize=262144)
+def _evaluate_bb(x: int, o: int, m: int, k: int) -> float:
     """
-    x_score = 0
-    o_score = 0
-    
-    # Check all k-length windows
-    for i in range(len(line) - k + 1):
-        window = line[i:i + k]
-        x_count = window.count('X')
-        o_count = window.count('O')
-        
-        # Score only if window is not blocked by opponent
-        if x_count > 0 and o_count == 0:
-            # Quadratic weighting: more pieces = exponentially better
-            x_score += x_count ** 2
-        elif o_count > 0 and x_count == 0:
-            o_score += o_count ** 2
-    
-    return x_score, o_score
-
-
-def _evaluate_rows(board: List[List[Optional[str]]], m: int, k: int) -> float:
-    """
-    Evaluate all rows on the board.
+    Evaluate a position given as raw bitboards.
+    Each window is scored with two ANDs and a popcount, with no per-cell
+    scanning. lru_cache keyed on the exact bitboards replaces the former
+    hand-rolled hash-keyed dict: the key cannot collide, eviction is LRU
+    rather than FIFO, and the bookkeeping runs in C.
     """
+    # Check terminal states first (single winner scan)
+    w = _compiled_winner(m, k)(x, o)
+    if w is not None:
+        return w
+    if (x | o) == (1 << (m * m)) - 1:
+        return 0
+
     score = 0.0
-    for row in board:
-        x_s, o_s = _count_sequences(row, k)
-        score += x_s - o_s
-    return score
+    for mask in _window_masks(m, k):
+        xw = x & mask
+        ow = o & mask
+        # Score only if window is not blocked by opponent; quadratic
+        # weighting: more pieces = exponentially better
+        if xw and not ow:
+            count = xw.bit_count()
+            score += count * count
+        elif ow and not xw:
+            count = ow.bit_count()
+            score -= count * count
 
+    # Add center control bonus
+    score += _center_control_bonus(x, o, m)
 
-def _evaluate_columns(board: List[List[Optional[str]]], m: int, k: int) -> float:
-    """
-    Evaluate all columns on the board.
-    """
-    score = 0.0
-    for c in range(m):
-        col = [board[r][c] for r in range(m)]
-        x_s, o_s = _count_sequences(col, k)
-        score += x_s - o_s
     return score
 
 
-def _evaluate_diagonals(board: List[List[Optional[str]]], m: int, k: int) -> float:
+@lru_cache(maxsize=None)
+def _windows_through(m: int, k: int) -> Tuple[Tuple[int, ...], ...]:
     """
-    Evaluate all top-left to bottom-right diagonals.
+    Window masks grouped by the cells they cover: entry i holds every
+    window mask that includes flat cell index i. Lets a child position be
+    rescored by touching only the windows its move can have changed.
     """
-    score = 0.0
-    for start_r in range(m - k + 1):
-        for start_c in range(m - k + 1):
-            diag = [board[start_r + i][start_c + i] 
-                   for i in range(m - max(start_r, start_c))]
-            x_s, o_s = _count_sequences(diag, k)
-            score += x_s - o_s
-    return score
+    per_cell = [[] for _ in range(m * m)]
+    for mask in _window_masks(m, k):
+        bb = mask
+        while bb:
+            bit = bb & -bb
+            per_cell[bit.bit_length() - 1].append(mask)
+            bb ^= bit
+    return tuple(tuple(ws) for ws in per_cell)
+
 
+def _window_score(mask: int, x: int, o: int) -> int:
+    """Quadratic contribution of one window: +count^2 X-only, -count^2 O-only."""
+    xw = x & mask
+    ow = o & mask
+    if xw and not ow:
+        count = xw.bit_count()
+        return count * count
+    if ow and not xw:
+        count = ow.bit_count()
+        return -count * count
+    return 0
 
-def _evaluate_anti_diagonals(board: List[List[Optional[str]]], m: int, k: int) -> float:
+
+def evaluate_children(state: dict,
+                      moves: list) -> list:
     """
-    Evaluate all top-right to bottom-left diagonals.
+    Evaluate every position one move away, sharing the parent's window
+    scan across all children. The full window pass runs once for the
+    parent; each child then rescores only the windows through its move's
+    cell (a handful instead of all of them) and adjusts the center bonus.
+    Returns (score, is_win) pairs aligned with moves, where score equals
+    evaluate() of the child position exactly and is_win flags children
+    the moving side wins outright.
     """
-    score = 0.0
-    for start_r in range(m - k + 1):
-        for start_c in range(k - 1, m):
-            diag = [board[start_r + i][start_c - i] 
-                   for i in range(min(m - start_r, start_c + 1))]
-            x_s, o_s = _count_sequences(diag, k)
-            score += x_s - o_s
-    return score
+    m = state['m']
+    k = state['k']
+    x = state['x']
+    o = state['o']
+    x_to_move = state['moves'] % 2 == 0
+    win = _compiled_winner(m, k)
+    full = (1 << (m * m)) - 1
+    per_cell = _windows_through(m, k)
+
+    base = 0.0
+    for mask in _window_masks(m, k):
+        base += _window_score(mask, x, o)
+
+    results = []
+    for r, c in moves:
+        idx = r * m + c
+        bit = 1 << idx
+        if x_to_move:
+            nx, no = x | bit, o
+        else:
+            nx, no = x, o | bit
+
+        w = win(nx, no)
+        if w is not None:
+            results.append((float(w), True))
+            continue
+        if (nx | no) == full:
+            results.append((0.0, False))
+            continue
+
+        delta = 0.0
+        for mask in per_cell[idx]:
+            delta += _window_score(mask, nx, no) - _window_score(mask, x, o)
+        results.append((base + delta + _center_control_bonus(nx, no, m), False))
+
+    return results
 
 
-def _center_control_bonus(board: List[List[Optional[str]]], m: int) -> float:
+def _center_control_bonus(x: int, o: int, m: int) -> float:
     """
     Calculate center control bonus.
     The center position is strategically valuable as it allows the most
     potential winning lines. This function adds a small bonus for controlling
     the center.
     """
-    center = m // 2
-    if board[center][center] == 'X':
+    center_bit = 1 << ((m // 2) * m + m // 2)
+    if x & center_bit:
         return 0.5
-    elif board[center][center] == 'O':
+    elif o & center_bit:
         return -0.5
-    return 0.0
\ No newline at end of file
+    return 0.0
@@ -3,10 +3,195 @@ Game engine module for generalized Tic-Tac-Toe.
 This module implements the core game rules for m×m Tic-Tac-Toe with k-in-a-row
 win condition. It provides functions for state management, move validation,
 and win detection.
+
+The board is stored as two integer bitboards ('x' and 'o'), one bit per cell
+in row-major order (bit r*m+c is cell (r, c)). Win detection is a single
+integer AND against precomputed k-in-a-row line masks instead of walking
+nested lists cell by cell.
 """
 
-from typing import List, Tuple, Optional
-import copy
+from functools import lru_cache
+from typing import Iterator, List, Tuple, Optional
+
+from transposition import zobrist_keys, zobrist_base
+
+# Player marks are small ints inside the engine: int comparison is a single
+# machine instruction, and +1/-1 line up with the utility values. Strings
+# appear only at the display/input boundary (print_board, MARKS).
+X = 1
+O = -1
+EMPTY = 0
+MARKS = {X: 'X', O: 'O'}
+
+
+@lru_cache(maxsize=None)
+def _win_masks(m: int, k: int) -> Tuple[int, ...]:
+    """
+    Precompute all k-in-a-row bitmasks for an m×m board.
+    Covers every contiguous k-cell run along rows, columns, diagonals,
+    and anti-diagonals. Computed once per (m, k) and cached.
+    """
+    masks = []
+
+    # Rows
+    for r in range(m):
+        for c in range(m - k + 1):
+            masks.append(sum(1 << (r * m + c + i) for i in range(k)))
+
+    # Columns
+    for c in range(m):
+        for r in range(m - k + 1):
+            masks.append(sum(1 << ((r + i) * m + c) for i in range(k)))
+
+    # Diagonals (top-left to bottom-right)
+    for r in range(m - k + 1):
+        for c in range(m - k + 1):
+            masks.append(sum(1 << ((r + i) * m + c + i) for i in range(k)))
+
+    # Anti-diagonals (top-right to bottom-left)
+    for r in range(m - k + 1):
+        for c in range(k - 1, m):
+            masks.append(sum(1 << ((r + i) * m + c - i) for i in range(k)))
+
+    return tuple(masks)
+
+
+@lru_cache(maxsize=None)
+def _shift_plans(m: int, k: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """
+    Precompute shift-AND reduction plans for k-in-a-row detection.
+    For a direction with stride s, a bit in t certifying a run of length a
+    combines with itself shifted by j*s (j <= a) to certify a run of
+    length a+j, so k is reached in O(log k) AND steps instead of checking
+    each line mask. Every step carries a guard mask that clears bits
+    whose shifted partner would wrap across a board edge (a column
+    constraint; row overflow falls off the end of the integer naturally).
+    Returns one (shift, guard) step sequence per direction
+    (row, column, diagonal, anti-diagonal).
+    """
+    directions = (
+        (1, lambda col, j: col <= m - 1 - j),        # rows
+        (m, lambda col, j: True),                    # columns
+        (m + 1, lambda col, j: col <= m - 1 - j),    # diagonals
+        (m - 1, lambda col, j: col >= j),            # anti-diagonals
+    )
+
+    plans = []
+    for stride, col_ok in directions:
+        steps = []
+        have = 1  # run length certified so far
+        while have < k:
+            step = min(have, k - have)
+            guard = 0
+            for idx in range(m * m):
+                if col_ok(idx % m, step):
+                    guard |= 1 << idx
+            steps.append((step * stride, guard))
+            have += step
+        plans.append(tuple(steps))
+    return tuple(plans)
+
+
+def _has_k_run(bb: int, plans: Tuple[Tuple[Tuple[int, int], ...], ...]) -> bool:
+    """
+    Test whether a bitboard contains k consecutive set bits along any
+    direction, using the precomputed shift-AND plans.
+    """
+    for plan in plans:
+        t = bb
+        for shift, guard in plan:
+            t &= (t >> shift) & guard
+            if not t:
+                break
+        if t:
+            return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def _compiled_winner(m: int, k: int):
+    """
+    Build a winner function specialized to one (m, k) configuration.
+    In a typical run the board configuration is fixed for the whole game,
+    so the generic _has_k_run loop (tuple unpacking, variable shifts) can
+    be partially evaluated away: the shift-AND reduction is unrolled into
+    straight-line code with the shift amounts and guard masks inlined as
+    integer literals, compiled once with exec and cached.
+    """
+    src = ["def _winner(x, o):"]
+    for var, mark in (('x', X), ('o', O)):
+        for plan in _shift_plans(m, k):
+            first = True
+            for shift, guard in plan:
+                if first:
+                    src.append(f"    t = {var} & ({var} >> {shift}) & {guard:#x}")
+                    first = False
+                else:
+                    src.append(f"    t &= (t >> {shift}) & {guard:#x}")
+            if first:
+                # k == 1: any stone is a win
+                src.append(f"    t = {var}")
+            src.append("    if t:")
+            src.append(f"        return {mark}")
+    src.append("    return None")
+
+    namespace = {}
+    exec("\n".join(src), namespace)
+    return namespace['_winner']
+
+
+@lru_cache(maxsize=None)
+def _symmetry_perms(m: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Flat-index permutations for the 8 dihedral symmetries of an m×m
+    board (identity, three rotations, four reflections). perm[i] is the
+    image of cell index i under the transform. Computed once per size.
+    """
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, m - 1 - r),          # rotate 90
+        lambda r, c: (m - 1 - r, m - 1 - c),  # rotate 180
+        lambda r, c: (m - 1 - c, r),          # rotate 270
+        lambda r, c: (r, m - 1 - c),          # flip horizontal
+        lambda r, c: (m - 1 - r, c),          # flip vertical
+        lambda r, c: (c, r),                  # flip main diagonal
+        lambda r, c: (m - 1 - c, m - 1 - r),  # flip anti-diagonal
+    )
+    perms = []
+    for t in transforms:
+        perm = [0] * (m * m)
+        for r in range(m):
+            for c in range(m):
+                tr, tc = t(r, c)
+                perm[r * m + c] = tr * m + tc
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+def _transform_bb(bb: int, perm: Tuple[int, ...]) -> int:
+    """Apply a cell-index permutation to a bitboard."""
+    out = 0
+    while bb:
+        bit = bb & -bb
+        out |= 1 << perm[bit.bit_length() - 1]
+        bb ^= bit
+    return out
+
+
+def canonical_key(state: dict) -> Tuple[int, int]:
+    """
+    Symmetry-invariant key for a position: the lexicographically
+    smallest (x, o) bitboard pair over the 8 dihedral transforms.
+    Two positions that are rotations or reflections of each other map
+    to the same key.
+    """
+    best = None
+    for perm in _symmetry_perms(state['m']):
+        pair = (_transform_bb(state['x'], perm),
+                _transform_bb(state['o'], perm))
+        if best is None or pair < best:
+            best = pair
+    return best
 
 
 def initial_state(m: int = 3, k: int = 3) -> dict:
@@ -14,118 +199,181 @@ def initial_state(m: int = 3, k: int = 3) -> dict:
     Create initial empty board state.
     """
     return {
-        'board': [[None for _ in range(m)] for _ in range(m)],
+        'x': 0,
+        'o': 0,
         'm': m,
         'k': k,
-        'moves': 0
+        'moves': 0,
+        'hash': zobrist_base(m, k),
+        'stack': []
     }
 
 
-def player(state: dict) -> str:
+def player(state: dict) -> int:
     """
     Determine whose turn it is.
     X always moves first. Players alternate turns based on the number
     of moves that have been made.
     """
-    return 'X' if state['moves'] % 2 == 0 else 'O'
+    return X if state['moves'] % 2 == 0 else O
+
+
+def cell(state: dict, r: int, c: int) -> int:
+    """
+    Get the mark at cell (r, c): X, O, or EMPTY.
+    """
+    bit = 1 << (r * state['m'] + c)
+    if state['x'] & bit:
+        return X
+    if state['o'] & bit:
+        return O
+    return EMPTY
+
+
+def to_board(state: dict) -> List[List[int]]:
+    """
+    Materialize the bitboards as a nested list of marks (X/O/EMPTY).
+    Convenience for display; the search itself operates on the bitboards
+    directly. Rows are allocated in one shot with [EMPTY] * m and only the
+    occupied cells are filled in.
+    """
+    m = state['m']
+    board = [[EMPTY] * m for _ in range(m)]
+    for side, mark in (('x', X), ('o', O)):
+        bb = state[side]
+        while bb:
+            bit = bb & -bb
+            idx = bit.bit_length() - 1
+            board[idx // m][idx % m] = mark
+            bb ^= bit
+    return board
+
+
+@lru_cache(maxsize=None)
+def _cell_coords(m: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    (r, c) pair for each flat cell index, computed once per board size
+    so move enumeration indexes a tuple instead of dividing per cell.
+    """
+    return tuple((i // m, i % m) for i in range(m * m))
 
 
 def actions(state: dict) -> List[Tuple[int, int]]:
     """
     Get all legal moves (empty cells).
+    Enumerates set bits of the complement of both bitboards, yielding
+    moves in row-major order. The bitboard itself is the incrementally
+    maintained empty-cell set — do_move/undo_move keep it current with
+    one XOR — so enumeration is O(number of empties), and the
+    index-to-coordinate step is a LUT lookup.
+    """
+    m = state['m']
+    coords = _cell_coords(m)
+    empties = ~(state['x'] | state['o']) & ((1 << (m * m)) - 1)
+    moves = []
+    while empties:
+        bit = empties & -empties
+        moves.append(coords[bit.bit_length() - 1])
+        empties ^= bit
+    return moves
+
+
+def iter_actions(state: dict) -> Iterator[Tuple[int, int]]:
+    """
+    Yield legal moves lazily, in the same row-major order as actions().
+    Useful inside alpha-beta loops: on a cutoff the unvisited moves are
+    simply never generated, instead of being allocated into a list and
+    discarded. Move ordering still needs the materialized actions() list.
     """
     m = state['m']
-    board = state['board']
-    return [(r, c) for r in range(m) for c in range(m) if board[r][c] is None]
+    coords = _cell_coords(m)
+    empties = ~(state['x'] | state['o']) & ((1 << (m * m)) - 1)
+    while empties:
+        bit = empties & -empties
+        yield coords[bit.bit_length() - 1]
+        empties ^= bit
 
 
 def result(state: dict, action: Tuple[int, int]) -> dict:
     """
     Apply action to state and return new state.
-    This function does not modify the original state. It creates a deep copy
-    and applies the move to the copy, ensuring immutability.
+    This function does not modify the original state. A shallow dict copy
+    is enough because the bitboards are immutable ints.
     """
     r, c = action
-    
+    bit = 1 << (r * state['m'] + c)
+
     # Validate move
-    if state['board'][r][c] is not None:
+    if (state['x'] | state['o']) & bit:
         raise ValueError(f"Invalid move: cell ({r}, {c}) is already occupied")
-    
+
     # Create new state
-    new_state = copy.deepcopy(state)
-    new_state['board'][r][c] = player(state)
+    new_state = dict(state)
+    if player(state) == X:
+        new_state['x'] |= bit
+        new_state['hash'] ^= zobrist_keys(state['m'], state['k'])[r * state['m'] + c][0]
+    else:
+        new_state['o'] |= bit
+        new_state['hash'] ^= zobrist_keys(state['m'], state['k'])[r * state['m'] + c][1]
     new_state['moves'] += 1
+    # The copy starts its own undo history; moves made before the copy
+    # cannot be undone through it
+    new_state['stack'] = []
     return new_state
 
 
-def _check_line(line: List[Optional[str]], k: int) -> Optional[str]:
+def do_move(state: dict, action: Tuple[int, int]) -> None:
     """
-    Check if a line contains k consecutive marks of the same player.
-    This is a helper function used by winner() to check rows, columns,
-    and diagonals for winning sequences.
+    Apply action to state in place, recording it on the state's undo stack.
+    This is the hot path used inside the search recursion: a bit-set and a
+    stack push instead of copying the whole state per child node. The move
+    is assumed legal (the search only generates legal moves); use result()
+    when validation is needed.
     """
-    if len(line) < k:
-        return None
-    
-    count = 0
-    current = None
-    
-    for cell in line:
-        if cell is not None and cell == current:
-            count += 1
-            if count >= k:
-                return current
-        else:
-            current = cell
-            count = 1 if cell is not None else 0
-    
-    return None
+    r, c = action
+    idx = r * state['m'] + c
+    side = state['moves'] % 2  # 0 = X, 1 = O
+    key = zobrist_keys(state['m'], state['k'])[idx][side]
+    state['x' if side == 0 else 'o'] |= 1 << idx
+    state['hash'] ^= key
+    state['moves'] += 1
+    state['stack'].append((idx, side, key))
 
 
-def winner(state: dict) -> Optional[str]:
+def undo_move(state: dict) -> None:
+    """
+    Revert the most recent do_move() on this state.
+    """
+    idx, side, key = state['stack'].pop()
+    state['x' if side == 0 else 'o'] ^= 1 << idx
+    state['hash'] ^= key
+    state['moves'] -= 1
+
+
+def winner(state: dict) -> Optional[int]:
     """
     Determine if there's a winner.
-    Checks all possible lines (rows, columns, and diagonals) for k consecutive
-    marks of the same player. Uses a sliding window approach to efficiently
-    check all diagonal segments.
+    Checks all four directions for k consecutive marks of the same player
+    using the shift-AND reduction, dispatched to a function specialized
+    (generated and compiled once) for this board configuration.
     """
-    board = state['board']
-    m = state['m']
-    k = state['k']
-    
-    # Check rows
-    for row in board:
-        w = _check_line(row, k)
-        if w:
-            return w
-    
-    # Check columns
-    for c in range(m):
-        col = [board[r][c] for r in range(m)]
-        w = _check_line(col, k)
-        if w:
-            return w
-    
-    # Check diagonals (top-left to bottom-right)
-    # Check all possible starting positions for k-length diagonals
-    for start_r in range(m - k + 1):
-        for start_c in range(m - k + 1):
-            diag = [board[start_r + i][start_c + i] 
-                   for i in range(m - max(start_r, start_c))]
-            w = _check_line(diag, k)
-            if w:
-                return w
-    
-    # Check anti-diagonals (top-right to bottom-left)
-    for start_r in range(m - k + 1):
-        for start_c in range(k - 1, m):
-            diag = [board[start_r + i][start_c - i] 
-                   for i in range(min(m - start_r, start_c + 1))]
-            w = _check_line(diag, k)
-            if w:
-                return w
-    
-    return None
+    return _compiled_winner(state['m'], state['k'])(state['x'], state['o'])
+
+
+def terminal_utility(state: dict) -> Tuple[bool, Optional[int]]:
+    """
+    Check for game over and compute the utility in a single pass.
+    Calling terminal() and then utility() scans the win masks twice for
+    the same position; this helper calls winner() once and returns both
+    answers: (True, +1/-1/0) for terminal states, (False, None) otherwise.
+    """
+    w = winner(state)
+    if w is not None:
+        # X/O marks are the utility values (+1/-1)
+        return True, w
+    if state['moves'] == state['m'] ** 2:
+        return True, 0
+    return False, None
 
 
 def terminal(state: dict) -> bool:
@@ -135,7 +383,7 @@ def terminal(state: dict) -> bool:
     1. There is a winner, or
     2. The board is full (all moves have been made)
     """
-    return winner(state) is not None or state['moves'] == state['m'] ** 2
+    return terminal_utility(state)[0]
 
 
 def utility(state: dict) -> Optional[int]:
@@ -147,26 +395,17 @@ def utility(state: dict) -> Optional[int]:
     -  0 if draw
     - None if state is not terminal
     """
-    if not terminal(state):
-        return None
-    
-    w = winner(state)
-    if w == 'X':
-        return 1
-    elif w == 'O':
-        return -1
-    else:
-        return 0
+    return terminal_utility(state)[1]
 
 
 def print_board(state: dict) -> None:
     """
     Print the current board state in a readable format.
     """
-    board = state['board']
+    board = to_board(state)
     m = state['m']
-    
+
     print("\n  " + " ".join(str(i) for i in range(m)))
     for i, row in enumerate(board):
-        print(f"{i} " + " ".join(cell if cell else '.' for cell in row))
-    print()
\ No newline at end of file
+        print(f"{i} " + " ".join(MARKS[v] if v else '.' for v in row))
+    print()
@@ -5,11 +5,12 @@ or between an AI and a human player.
 """
 
 from typing import Optional, Callable
-from game_engine import initial_state, terminal, player, actions, result, winner, print_board
+from game_engine import (initial_state, terminal, player, actions, result,
+                         winner, print_board, cell, X, EMPTY, MARKS)
 
 
-def play_game(agent1_fn: Callable, agent2_fn: Optional[Callable] = None, 
-              m: int = 3, k: int = 3, verbose: bool = True) -> Optional[str]:
+def play_game(agent1_fn: Callable, agent2_fn: Optional[Callable] = None,
+              m: int = 3, k: int = 3, verbose: bool = True) -> Optional[int]:
     """
     Play a complete game of Tic-Tac-Toe.
     This function manages a full game between two agents (or an agent and a human).
@@ -20,10 +21,10 @@ def play_game(agent1_fn: Callable, agent2_fn: Optional[Callable] = None,
     while not terminal(state):
         if verbose:
             print_board(state)
-            print(f"Player {player(state)}'s turn")
-        
+            print(f"Player {MARKS[player(state)]}'s turn")
+
         # Get move from appropriate agent
-        if player(state) == 'X':
+        if player(state) == X:
             _, move = agent1_fn(state)
         else:
             if agent2_fn:
@@ -43,7 +44,7 @@ def play_game(agent1_fn: Callable, agent2_fn: Optional[Callable] = None,
         print_board(state)
         w = winner(state)
         if w:
-            print(f"Winner: {w}")
+            print(f"Winner: {MARKS[w]}")
         else:
             print("Draw!")
     
@@ -53,20 +54,23 @@ def play_game(agent1_fn: Callable, agent2_fn: Optional[Callable] = None,
 def get_human_move(state: dict) -> tuple:
     """
     Get move input from human player.
-    Prompts the user to enter a move and validates it against legal moves.
-    Continues prompting until a legal move is entered.
+    Prompts the user to enter a move and validates it, re-prompting until
+    a legal move is entered. Input is parsed as two integers (no eval),
+    and legality is a direct check of the target cell rather than a
+    membership test against the full move list.
     """
-    legal = actions(state)
-    print(f"Legal moves: {legal}")
-    
+    m = state['m']
+    print(f"Legal moves: {actions(state)}")
+
     while True:
+        move_str = input("Enter move as (row, col): ")
         try:
-            move_str = input("Enter move as (row, col): ")
-            move = eval(move_str)
-            
-            if move in legal:
-                return move
-            else:
-                print(f"Invalid move. Please choose from: {legal}")
-        except:
-            print("Invalid format. Please enter as (row, col), e.g., (1, 1)")
\ No newline at end of file
+            parts = move_str.replace('(', ' ').replace(')', ' ').replace(',', ' ').split()
+            r, c = (int(p) for p in parts)
+        except ValueError:
+            print("Invalid format. Please enter as (row, col), e.g., (1, 1)")
+            continue
+
+        if 0 <= r < m and 0 <= c < m and cell(state, r, c) == EMPTY:
+            return (r, c)
+        print(f"Invalid move. Cell ({r}, {c}) is not available.")
\ No newline at end of file
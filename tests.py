@@ -7,9 +7,12 @@ Usage:
     python tests.py
 """
 
-from game_engine import (initial_state, player, actions, result, winner, 
-                         terminal, utility, print_board)
-from search import minimax, minimax_ab, search
+from game_engine import (initial_state, player, actions, result, winner,
+                         terminal, utility, print_board, cell,
+                         do_move, undo_move, terminal_utility, X, O)
+from search import minimax, minimax_ab, search, _store_tt
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from evaluation import evaluate
 from gameplay import play_game
 
 
@@ -22,7 +25,7 @@ def test_game_engine():
     # Test 1: Initial state
     print("\n[Test 1] Initial state creation")
     state = initial_state(3, 3)
-    assert player(state) == 'X', "First player should be X"
+    assert player(state) == X, "First player should be X"
     assert len(actions(state)) == 9, "3x3 board should have 9 actions"
     assert not terminal(state), "Initial state should not be terminal"
     print(" Initial state correct")
@@ -30,8 +33,8 @@ def test_game_engine():
     # Test 2: State transitions
     print("\n[Test 2] State transitions")
     state = result(state, (1, 1))
-    assert player(state) == 'O', "After X moves, should be O's turn"
-    assert state['board'][1][1] == 'X', "X should be at (1,1)"
+    assert player(state) == O, "After X moves, should be O's turn"
+    assert cell(state, 1, 1) == X, "X should be at (1,1)"
     assert len(actions(state)) == 8, "Should have 8 remaining moves"
     print(" State transitions working")
     
@@ -43,7 +46,7 @@ def test_game_engine():
     state = result(state, (0, 1))  # X
     state = result(state, (1, 1))  # O
     state = result(state, (0, 2))  # X - wins
-    assert winner(state) == 'X', "X should win with row"
+    assert winner(state) == X, "X should win with row"
     assert terminal(state), "Game should be terminal"
     assert utility(state) == 1, "Utility should be +1 for X win"
     print(" Row win detected")
@@ -56,7 +59,7 @@ def test_game_engine():
     state = result(state, (1, 1))  # X
     state = result(state, (0, 2))  # O
     state = result(state, (2, 2))  # X - wins diagonal
-    assert winner(state) == 'X', "X should win with diagonal"
+    assert winner(state) == X, "X should win with diagonal"
     print(" Diagonal win detected")
     
     # Test 5: Draw detection
@@ -108,7 +111,7 @@ def test_search_algorithms():
     # X has (0,0) and (0,1), should take (0,2) to win
     value, move = search(state, depth=4)
     test_state = result(state, move)
-    assert winner(test_state) == 'X', f"Move {move} should lead to X win"
+    assert winner(test_state) == X, f"Move {move} should lead to X win"
     print(f" Found winning move: {move}")
     
     # Test 4: Threat blocking
@@ -142,7 +145,7 @@ def test_edge_cases():
     state = result(state, (1, 1))  # X
     state = result(state, (0, 1))  # O
     state = result(state, (2, 0))  # X - wins anti-diagonal
-    assert winner(state) == 'X', "X should win anti-diagonal"
+    assert winner(state) == X, "X should win anti-diagonal"
     print(" Anti-diagonal win detected")
     
     # Test 2: 4x4 with k=4
@@ -152,7 +155,7 @@ def test_edge_cases():
         state = result(state, (0, i))  # X
         if i < 3:
             state = result(state, (1, i))  # O
-    assert winner(state) == 'X', "X should win with 4-in-a-row"
+    assert winner(state) == X, "X should win with 4-in-a-row"
     print(" 4x4 k=4 win detected")
     
     # Test 3: 5x5 diagonal
@@ -162,7 +165,7 @@ def test_edge_cases():
         state = result(state, (i, i))  # X
         if i < 3:
             state = result(state, (i, i+1))  # O
-    assert winner(state) == 'X', "X should win diagonal on 5x5"
+    assert winner(state) == X, "X should win diagonal on 5x5"
     print(" 5x5 diagonal win detected")
     
     # Test 4: Column win
@@ -173,7 +176,7 @@ def test_edge_cases():
     state = result(state, (1, 0))  # X
     state = result(state, (1, 1))  # O
     state = result(state, (2, 0))  # X - wins column
-    assert winner(state) == 'X', "X should win with column"
+    assert winner(state) == X, "X should win with column"
     print(" Column win detected")
     
     print("\n" + "="*60)
@@ -181,6 +184,71 @@ def test_edge_cases():
     print("="*60)
 
 
+def test_search_internals():
+    """Test the search support machinery directly."""
+    print("\n" + "="*60)
+    print("TEST SUITE: Search Internals")
+    print("="*60)
+
+    # Test 1: Transposition table store/probe and bound classification
+    print("\n[Test 1] Transposition table store/probe")
+    tt = TranspositionTable()
+    assert tt.probe(42) is None, "Empty table should probe to None"
+    _store_tt(tt, 1, 3, -2.0, -1.0, 1.0)           # fails low
+    _store_tt(tt, 2, 3, 2.0, -1.0, 1.0)            # fails high
+    _store_tt(tt, 3, 3, 0.5, -1.0, 1.0, (1, 1))    # inside the window
+    assert tt.probe(1)[2] == UPPER, "Value <= alpha should store an upper bound"
+    assert tt.probe(2)[2] == LOWER, "Value >= beta should store a lower bound"
+    assert tt.probe(3) == (3, 0.5, EXACT, (1, 1)), "In-window entry should be exact"
+    _store_tt(tt, 3, 5, 0.25, -1.0, 1.0, (0, 2))
+    assert tt.probe(3) == (5, 0.25, EXACT, (0, 2)), "Store should replace the entry"
+    assert len(tt) == 3, "Table should hold one entry per key"
+    print(" Bound flags and probe results correct")
+
+    # Test 2: do_move/undo_move round-trip
+    print("\n[Test 2] do_move/undo_move round-trip")
+    state = initial_state(4, 3)
+    state = result(state, (1, 1))
+    snapshot = (state['x'], state['o'], state['hash'], state['moves'])
+    do_move(state, (0, 0))
+    do_move(state, (2, 2))
+    assert cell(state, 0, 0) == O and cell(state, 2, 2) == X
+    undo_move(state)
+    undo_move(state)
+    assert (state['x'], state['o'], state['hash'], state['moves']) == snapshot, \
+        "Undoing both moves should restore bitboards, hash and move count"
+    assert not state['stack'], "Undo stack should be empty again"
+    print(" State restored exactly after nested do/undo")
+
+    # Test 3: Depth-limited search matches a reference minimax (4x4)
+    print("\n[Test 3] Depth-limited search vs reference (4x4)")
+
+    def reference(s, d):
+        done, u = terminal_utility(s)
+        if done:
+            return 1000 * u
+        if d == 0:
+            return evaluate(s)
+        values = [reference(result(s, a), d - 1) for a in actions(s)]
+        return max(values) if player(s) == X else min(values)
+
+    state = initial_state(4, 3)
+    state = result(state, (0, 0))  # X
+    state = result(state, (3, 3))  # O
+    state = result(state, (0, 1))  # X
+    state = result(state, (3, 2))  # O
+    for d in (1, 2):
+        value, move = search(state, depth=d)
+        expected = reference(state, d)
+        assert value == expected, \
+            f"search depth {d} returned {value}, reference says {expected}"
+    print(" Search values match the reference at depths 1-2")
+
+    print("\n" + "="*60)
+    print("Search Internals: ALL TESTS PASSED ")
+    print("="*60)
+
+
 def test_integration():
     """Test full game integration."""
     print("\n" + "="*60)
@@ -216,6 +284,7 @@ def run_all_tests():
         test_game_engine()
         test_search_algorithms()
         test_edge_cases()
+        test_search_internals()
         test_integration()
         
         print("\n" + "="*60)
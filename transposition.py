@@ -0,0 +1,75 @@
+"""
+Transposition table support for Tic-Tac-Toe search.
+The same position is frequently reached through different move orders
+(transpositions); caching search results by a Zobrist hash of the position
+lets alpha-beta treat the game tree as a DAG instead of re-expanding
+identical subtrees.
+
+Entries store the searched depth, the value, a bound flag, and the best
+move found, so cached values can be reused correctly inside an alpha-beta
+window and the stored move can seed move ordering (principal variation
+first) on later searches:
+- EXACT: value is the true minimax value
+- LOWER: value is a lower bound (search failed high)
+- UPPER: value is an upper bound (search failed low)
+"""
+
+import random
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+# Bound flags for stored values
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+@lru_cache(maxsize=None)
+def _zobrist(m: int, k: int) -> Tuple[int, Tuple[Tuple[int, int], ...]]:
+    """Generate the base key and per-cell keys for an (m, k) configuration."""
+    rng = random.Random((0x7BB0 << 16) | (m << 8) | k)
+    base = rng.getrandbits(64)
+    keys = tuple((rng.getrandbits(64), rng.getrandbits(64))
+                 for _ in range(m * m))
+    return base, keys
+
+
+def zobrist_keys(m: int, k: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Generate 64-bit Zobrist keys for each (cell, player) pair on an m×m board.
+    Index [r*m + c] gives the (X key, O key) pair for cell (r, c). Seeded
+    deterministically per (m, k) so hashes are reproducible across runs and
+    positions from different board configurations never share keys.
+    """
+    return _zobrist(m, k)[1]
+
+
+def zobrist_base(m: int, k: int) -> int:
+    """
+    Hash of the empty board for an (m, k) configuration.
+    Distinct per configuration so cached values keyed by hash (evaluation
+    cache, transposition table) can never collide across board setups.
+    """
+    return _zobrist(m, k)[0]
+
+
+class TranspositionTable:
+    """Hash table mapping position hashes to search results."""
+
+    def __init__(self):
+        self.table = {}
+
+    def probe(self, key: int) -> Optional[tuple]:
+        """Look up the entry for a position hash, or None if absent."""
+        return self.table.get(key)
+
+    def store(self, key: int, depth: int, value: float, flag: int,
+              move: Optional[Tuple[int, int]] = None) -> None:
+        """Record a search result as a (depth, value, flag, move) entry."""
+        self.table[key] = (depth, value, flag, move)
+
+    def clear(self) -> None:
+        """Drop all entries (e.g. between benchmark runs)."""
+        self.table.clear()
+
+    def __len__(self) -> int:
+        return len(self.table)